@@ -4,8 +4,12 @@ import logging
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryError
 
-from .const import DOMAIN
+from .const import (
+    CONF_IDENTIFIER, CONF_LIGHT_MAX_RAW, DEFAULT_LIGHT_MAX_RAW, DOMAIN,
+    LIGHT_MAX_RAW_MAX, LIGHT_MAX_RAW_MIN, TUNING_OPTIONS,
+)
 from .ble import DeviceConfig, SenseBleController
 
 PLATFORMS: list[str] = ["fan", "light", "switch"]
@@ -15,17 +19,30 @@ _LOGGER = logging.getLogger(__name__)
 _LOGGER.info("Initializing Røroshetta Sense integration")
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    cfg = DeviceConfig(
-        identifier=entry.data["identifier"],
-        light_max_raw=entry.data.get("light_max_raw", 90),
-    )
+    light_max_raw = entry.data.get(CONF_LIGHT_MAX_RAW, DEFAULT_LIGHT_MAX_RAW)
+    # Entries created before the form validated the range may hold any value
+    clamped = min(max(int(light_max_raw), LIGHT_MAX_RAW_MIN), LIGHT_MAX_RAW_MAX)
+    if clamped != light_max_raw:
+        _LOGGER.warning("light_max_raw %s out of range, using %s", light_max_raw, clamped)
+    try:
+        cfg = DeviceConfig(
+            identifier=entry.data[CONF_IDENTIFIER],
+            light_max_raw=clamped,
+            **{key: entry.options[key] for key in TUNING_OPTIONS if key in entry.options},
+        )
+    except ValueError as e:
+        raise ConfigEntryError(f"Invalid tuning option: {e}") from e
     controller = SenseBleController(cfg, hass)
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = controller
+    controller.start()
+    controller.track_advertisements()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     controller: SenseBleController = hass.data[DOMAIN].pop(entry.entry_id)
+    # Stop advertisement callbacks first so nothing reconnects while unloading
+    controller.untrack_advertisements()
     await controller.disconnect()
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
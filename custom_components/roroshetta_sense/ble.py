@@ -2,57 +2,153 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from dataclasses import dataclass
+import random
+from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Optional
 
 from bleak import BleakClient
+from bleak.backends.characteristic import BleakGATTCharacteristic
 from bleak.exc import BleakError, BleakDeviceNotFoundError
 from homeassistant.components import bluetooth
-from homeassistant.core import HomeAssistant
+from homeassistant.components.bluetooth import (
+    BluetoothCallbackMatcher, BluetoothChange, BluetoothScanningMode, BluetoothServiceInfoBleak,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 
-from .const import COMMAND_CHAR_UUID, DEFAULT_LIGHT_MAX_RAW
+from .const import (
+    COMMAND_CHAR_UUID, COMMAND_DEBOUNCE_S, DEFAULT_LIGHT_MAX_RAW, WRITE_TIMEOUT_S,
+)
 from .protocol import (
     FAN_MANUAL_CMD, FAN_AUTO_CMD,
     LIGHT_LEVEL_CMD, LIGHT_AUTO_CMD,
-    FAN_MAX_RAW_DEFAULT, pct_to_raw, render_cmd,
+    FAN_MAX_RAW_DEFAULT, LEVEL_INDEX, clamp_pct, pct_table, render_cmd,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+_COMMAND_CHAR_UUID_LC = COMMAND_CHAR_UUID.lower()
+
+_FAN_AUTO_BYTES = render_cmd(FAN_AUTO_CMD)
+_LIGHT_AUTO_BYTES = render_cmd(LIGHT_AUTO_CMD)
+
+class _Hex:
+    """Defer hex formatting of a payload until a log record is actually emitted."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+
+    def __str__(self) -> str:
+        return self._data.hex().upper()
+
+def _is_number(value: object) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
 @dataclass
 class DeviceConfig:
     identifier: str
     light_max_raw: int = DEFAULT_LIGHT_MAX_RAW
     fan_max_raw: int = FAN_MAX_RAW_DEFAULT
+    # Link tuning; adapters (local BlueZ, ESPHome proxy, USB dongle) differ a lot
+    max_retries: int = 3
+    connect_timeout: float = 10.0
+    write_post_delay: float = 0.0
+    backoff_base: float = 0.5
+    backoff_cap: float = 30.0
+    # Rendered level frames indexed by percent, shared between configs with
+    # the same template and max_raw
+    fan_pct_bytes: tuple[bytes, ...] = field(init=False, repr=False)
+    light_pct_bytes: tuple[bytes, ...] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # Tuning values come straight from entry.options, so check them here
+        if not _is_number(self.max_retries) or isinstance(self.max_retries, float) or self.max_retries < 1:
+            raise ValueError(f"max_retries must be an integer >= 1, got {self.max_retries!r}")
+        for name in ("connect_timeout", "backoff_base", "backoff_cap"):
+            value = getattr(self, name)
+            if not _is_number(value) or value <= 0:
+                raise ValueError(f"{name} must be a number > 0, got {value!r}")
+        if not _is_number(self.write_post_delay) or self.write_post_delay < 0:
+            raise ValueError(f"write_post_delay must be a number >= 0, got {self.write_post_delay!r}")
+        self.fan_pct_bytes = pct_table(FAN_MANUAL_CMD, self.fan_max_raw)
+        self.light_pct_bytes = pct_table(LIGHT_LEVEL_CMD, self.light_max_raw)
+
+def _is_fatal_write_error(err: BleakError, msg: str) -> bool:
+    """Whether a write error means the connection itself is gone.
+
+    Busy/in-progress and GATT-level errors leave the link usable, so tearing
+    it down would only force a full reconnect and service rediscovery.
+    """
+    return (
+        isinstance(err, BleakDeviceNotFoundError)
+        # A write that never completed means the link or adapter is wedged
+        or isinstance(err.__cause__, asyncio.TimeoutError)
+        or "not connected" in msg
+        or "disconnected" in msg
+    )
 
 class SenseBleController:
     def __init__(self, cfg: DeviceConfig, hass: HomeAssistant) -> None:
         self._cfg = cfg
         self._hass = hass
         self._client: Optional[BleakClient] = None
-        self._lock = asyncio.Lock()
-        self._connection_attempts = 0
-        self._max_retries = 3
+        self._cmd_char: Optional[BleakGATTCharacteristic] = None
+        self._char_by_uuid: dict[str, BleakGATTCharacteristic] = {}
+        self._mtu: Optional[int] = None
+        # Per-instance RNG so retries from sibling integrations don't line up
+        self._rng = random.Random()
+        # Latest not-yet-written payload per channel ("fan"/"light"); newer
+        # setpoints overwrite older ones so a slider burst becomes one write.
+        self._pending: dict[str, tuple[bytes, asyncio.Future[None]]] = {}
+        # Channels with a pending command, in the order they were first queued;
+        # None asks the runner to (re)connect ahead of any command.
+        # Only the runner task touches the BLE client; producers just enqueue.
+        self._cmd_q: asyncio.Queue[Optional[str]] = asyncio.Queue()
+        self._runner: Optional[asyncio.Task[None]] = None
+        # Set while a connect attempt runs so concurrent callers share it
+        self._connecting: Optional[asyncio.Event] = None
+        # Loop time of the last failed connect; pre-warming waits out backoff_cap after it
+        self._last_connect_failure: Optional[float] = None
+        self._cancel_advertisements: Optional[CALLBACK_TYPE] = None
+        # Set by disconnect(); a closed controller never starts or connects again
+        self._closed = False
+
+    @cached_property
+    def identifier(self) -> str:
+        """BLE address/identifier of the device this controller drives."""
+        return self._cfg.identifier
 
     async def connect(self) -> None:
-        # Always clean up any existing client first to prevent slot leaks
-        if self._client:
-            try:
-                if self._client.is_connected:
-                    await self._client.disconnect()
-            except Exception as e:
-                _LOGGER.debug("Error disconnecting existing client: %s", e)
-            finally:
-                self._client = None
-                
         if self._client and self._client.is_connected:
             return
-            
-        for attempt in range(self._max_retries):
+        if self._connecting is not None:
+            # Another caller is already connecting; share its outcome. Only the
+            # writer task calls connect() today, so this path is defensive.
+            await self._connecting.wait()
+            if not (self._client and self._client.is_connected):
+                raise BleakError(f"Shared connect to {self._cfg.identifier} failed")
+            return
+
+        self._connecting = connecting = asyncio.Event()
+        try:
+            await self._connect_with_retries()
+        except BaseException:
+            self._last_connect_failure = self._hass.loop.time()
+            raise
+        else:
+            self._last_connect_failure = None
+        finally:
+            connecting.set()
+            self._connecting = None
+
+    async def _connect_with_retries(self) -> None:
+        for attempt in range(self._cfg.max_retries):
             try:
                 _LOGGER.debug(
                     "Attempting BLE connection to %s (attempt %d/%d)",
-                    self._cfg.identifier, attempt + 1, self._max_retries
+                    self._cfg.identifier, attempt + 1, self._cfg.max_retries
                 )
                 
                 # Use Home Assistant's bluetooth API to get the device
@@ -60,46 +156,130 @@ class SenseBleController:
                 if not ble_device:
                     raise BleakDeviceNotFoundError(f"Device {self._cfg.identifier} not reachable")
                 
-                self._client = BleakClient(ble_device, timeout=10.0)
+                self._client = BleakClient(ble_device, timeout=self._cfg.connect_timeout)
                 await self._client.connect()
                 _LOGGER.debug("BLE connection successful to %s", self._cfg.identifier)
+
+                await self._acquire_mtu()
+
+                # Resolve the command characteristic once so writes can skip the
+                # UUID-to-handle lookup and per-write service enumeration
+                services = self._client.services
+                self._char_by_uuid = {
+                    char.uuid.lower(): char
+                    for service in services.services.values()
+                    for char in service.characteristics
+                }
+                self._cmd_char = self._char_by_uuid.get(_COMMAND_CHAR_UUID_LC)
+                if self._cmd_char is None:
+                    raise BleakError(f"Command characteristic {COMMAND_CHAR_UUID} not found")
                 
                 # Discover and log services/characteristics for debugging
                 await self._discover_services()
-                
-                # Test device responsiveness on first connection
-                if self._connection_attempts == 0:
-                    await self.test_device_responsiveness()
-                
-                self._connection_attempts = 0
                 return
                 
             except Exception as e:
                 if isinstance(e, BleakDeviceNotFoundError):
                     _LOGGER.warning(
                         "Device %s not found (attempt %d/%d)", 
-                        self._cfg.identifier, attempt + 1, self._max_retries
+                        self._cfg.identifier, attempt + 1, self._cfg.max_retries
                     )
                 elif isinstance(e, BleakError):
                     _LOGGER.warning(
                         "BLE error connecting to %s (attempt %d/%d): %s",
-                        self._cfg.identifier, attempt + 1, self._max_retries, e
+                        self._cfg.identifier, attempt + 1, self._cfg.max_retries, e
                     )
                 else:
                     _LOGGER.error(
                         "Unexpected error connecting to %s (attempt %d/%d): %s",
-                        self._cfg.identifier, attempt + 1, self._max_retries, e
+                        self._cfg.identifier, attempt + 1, self._cfg.max_retries, e
                     )
                 # Clean up failed client to prevent slot leak
                 await self._cleanup_client()
                         
-            if attempt < self._max_retries - 1:
-                await asyncio.sleep(2 ** attempt)  # Exponential backoff
+            if attempt < self._cfg.max_retries - 1:
+                await asyncio.sleep(self._backoff(attempt))
                 
-        self._connection_attempts += 1
-        raise BleakError(f"Failed to connect to device {self._cfg.identifier} after {self._max_retries} attempts")
+        raise BleakError(f"Failed to connect to device {self._cfg.identifier} after {self._cfg.max_retries} attempts")
+
+    async def _acquire_mtu(self) -> None:
+        """Run the ATT MTU exchange once per connection where the backend supports it."""
+        # BlueZ only negotiates the MTU lazily; its backend exposes a private
+        # hook to do it up front. Other backends report the MTU directly.
+        acquire = getattr(getattr(self._client, "_backend", None), "_acquire_mtu", None)
+        if acquire is not None:
+            try:
+                await acquire()
+            except Exception as e:
+                _LOGGER.debug("MTU exchange failed, keeping default: %s", e)
+        self._mtu = self._client.mtu_size
+        _LOGGER.debug("BLE MTU for %s: %d", self._cfg.identifier, self._mtu)
+
+    def _backoff(self, attempt: int, scale: float = 1.0) -> float:
+        """Exponential backoff with full jitter for the given zero-based attempt."""
+        cap = min(self._cfg.backoff_cap, scale * self._cfg.backoff_base * 2 ** attempt)
+        return self._rng.uniform(0, cap)
+
+    def start(self) -> None:
+        """Start the task that owns the BLE connection, if not already running."""
+        if self._closed:
+            return
+        if self._runner is None or self._runner.done():
+            self._runner = self._hass.async_create_background_task(
+                self._run(), f"roroshetta_sense writer {self._cfg.identifier}"
+            )
+
+    @callback
+    def on_advertisement(self, service_info: BluetoothServiceInfoBleak, change: BluetoothChange) -> None:
+        """Pre-warm the connection when the device shows up, so the first command skips connecting."""
+        if not self._should_prewarm():
+            return
+        self._cmd_q.put_nowait(None)
+        self.start()
+
+    def _should_prewarm(self) -> bool:
+        """Whether a pre-warm connect is worth starting now.
+
+        Checked again by the runner, so advertisements queued before an attempt
+        starts become no-ops once it has connected or failed.
+        """
+        if self._closed or self._connecting is not None:
+            return False
+        if self._client and self._client.is_connected:
+            return False
+        # Don't start another full retry cycle on every advertisement while the
+        # device is visible but refusing connections
+        return (
+            self._last_connect_failure is None
+            or self._hass.loop.time() - self._last_connect_failure >= self._cfg.backoff_cap
+        )
+
+    def track_advertisements(self) -> None:
+        """Connect as soon as the device is seen instead of on the first command."""
+        if self._cancel_advertisements is None:
+            self._cancel_advertisements = bluetooth.async_register_callback(
+                self._hass,
+                self.on_advertisement,
+                BluetoothCallbackMatcher(address=self._cfg.identifier),
+                BluetoothScanningMode.ACTIVE,
+            )
+
+    def untrack_advertisements(self) -> None:
+        if self._cancel_advertisements is not None:
+            self._cancel_advertisements()
+            self._cancel_advertisements = None
 
     async def disconnect(self) -> None:
+        self._closed = True
+        self.untrack_advertisements()
+        if self._runner and not self._runner.done():
+            self._runner.cancel()
+        self._runner = None
+        self._cmd_q = asyncio.Queue()
+        for _, fut in self._pending.values():
+            if not fut.done():
+                fut.cancel()
+        self._pending.clear()
         await self._cleanup_client()
 
     async def _cleanup_client(self) -> None:
@@ -113,55 +293,66 @@ class SenseBleController:
                 _LOGGER.debug("Error during client cleanup: %s", e)
             finally:
                 self._client = None
+                self._cmd_char = None
+                self._char_by_uuid = {}
+                self._mtu = None
                 _LOGGER.debug("BLE client cleaned up")
 
-    async def _write(self, payload: bytes, delay_s: float = 0.2) -> None:
-        _LOGGER.info(
+    async def _write(self, payload: bytes) -> None:
+        _LOGGER.debug(
             "BLE COMMAND: Sending %d bytes to %s: %s", 
-            len(payload), COMMAND_CHAR_UUID, payload.hex().upper()
+            len(payload), COMMAND_CHAR_UUID, _Hex(payload)
         )
         
-        for attempt in range(self._max_retries):
+        for attempt in range(self._cfg.max_retries):
             try:
-                await self.connect()
-                
-                # Verify connection state before attempting write
-                if not await self.verify_connection_state():
-                    raise BleakError("Device not ready for commands")
+                if not (self._client and self._client.is_connected):
+                    await self.connect()
+                    if not (self._client and self._client.is_connected):
+                        raise BleakError("Device not connected")
                     
                 _LOGGER.debug(
-                    "BLE WRITE: Attempt %d/%d - Connection verified", 
-                    attempt + 1, self._max_retries
+                    "BLE WRITE: Attempt %d/%d - Connected", 
+                    attempt + 1, self._cfg.max_retries
                 )
                 
-                async with self._lock:
-                    _LOGGER.debug("BLE WRITE: Writing to characteristic %s", COMMAND_CHAR_UUID)
-                    await self._client.write_gatt_char(COMMAND_CHAR_UUID, payload, response=False)
-                    _LOGGER.info("BLE WRITE: Successfully wrote %s", payload.hex().upper())
-                    
-                    if delay_s:
-                        await asyncio.sleep(delay_s)
+                _LOGGER.debug("BLE WRITE: Writing to characteristic %s", COMMAND_CHAR_UUID)
+                try:
+                    await asyncio.wait_for(
+                        self._client.write_gatt_char(self._cmd_char, payload, response=False),
+                        timeout=WRITE_TIMEOUT_S,
+                    )
+                except asyncio.TimeoutError as e:
+                    raise BleakError(f"Write timeout after {WRITE_TIMEOUT_S}s") from e
+                _LOGGER.debug("BLE WRITE: Successfully wrote %s", _Hex(payload))
+                if self._cfg.write_post_delay:
+                    await asyncio.sleep(self._cfg.write_post_delay)
                 return
                 
             except BleakError as e:
                 _LOGGER.warning(
                     "BLE write error (attempt %d/%d): %s", 
-                    attempt + 1, self._max_retries, e
+                    attempt + 1, self._cfg.max_retries, e
                 )
+                msg = str(e).lower()
                 # Add specific error analysis
-                if "not connected" in str(e).lower():
+                if "not connected" in msg:
                     _LOGGER.error("BLE ERROR: Device disconnected during write")
-                elif "gatt" in str(e).lower():
+                elif "gatt" in msg:
                     _LOGGER.error("BLE ERROR: GATT operation failed - characteristic issue?")
-                elif "timeout" in str(e).lower():
+                elif "timeout" in msg:
                     _LOGGER.error("BLE ERROR: Write operation timed out")
                 else:
                     _LOGGER.error("BLE ERROR: Unknown BLE error type: %s", type(e).__name__)
-                # Force cleanup to free connection slot
-                await self._cleanup_client()
+
+                fatal = _is_fatal_write_error(e, msg)
+                if fatal:
+                    # Force cleanup to free connection slot
+                    await self._cleanup_client()
                         
-                if attempt < self._max_retries - 1:
-                    await asyncio.sleep(1)
+                if attempt < self._cfg.max_retries - 1:
+                    # Transient errors retry on the same client after a short pause
+                    await asyncio.sleep(self._backoff(attempt, 1.0 if fatal else 0.25))
                 else:
                     raise
                     
@@ -170,40 +361,100 @@ class SenseBleController:
                 # Force cleanup to free connection slot
                 await self._cleanup_client()
                         
-                if attempt < self._max_retries - 1:
-                    await asyncio.sleep(1)
+                if attempt < self._cfg.max_retries - 1:
+                    await asyncio.sleep(self._backoff(attempt))
                 else:
-                    raise BleakError(f"Failed to write to device after {self._max_retries} attempts: {e}")
+                    raise BleakError(f"Failed to write to device after {self._cfg.max_retries} attempts: {e}")
+
+        # Every attempt either returns or raises, so only a zero-attempt config gets here
+        raise BleakError(f"Failed to write to device after {self._cfg.max_retries} attempts")
+
+    async def _submit(self, key: str, payload: bytes) -> None:
+        """Queue payload for channel key, replacing any unsent earlier payload."""
+        if self._closed:
+            raise BleakError(f"Controller for {self._cfg.identifier} is shut down")
+        pending = self._pending.get(key)
+        if pending is None:
+            fut = self._hass.loop.create_future()
+            self._cmd_q.put_nowait(key)
+        else:
+            old_payload, fut = pending
+            _LOGGER.debug("BLE BATCH: Superseding pending %s command %s", key, _Hex(old_payload))
+            # Byte 0 is the opcode: a newer level may answer for an older level,
+            # but a manual/auto switch must not report the replaced command as sent.
+            if old_payload[0] != payload[0]:
+                fut.set_exception(BleakError(f"Superseded by a newer {key} command"))
+                fut = self._hass.loop.create_future()
+        self._pending[key] = (payload, fut)
+
+        self.start()
+        # Shield so one cancelled caller doesn't cancel the write for everyone
+        # waiting on the same coalesced command.
+        await asyncio.shield(fut)
+
+    async def _run(self) -> None:
+        """Own the BLE client: connect once, then write queued commands in order."""
+        try:
+            await self.connect()
+        except BleakError as e:
+            _LOGGER.debug("Initial connect to %s failed, retrying on first command: %s", self._cfg.identifier, e)
+
+        while True:
+            key = await self._cmd_q.get()
+            if key is None:
+                if self._should_prewarm():
+                    try:
+                        await self.connect()
+                    except BleakError as e:
+                        _LOGGER.debug("Pre-warm connect to %s failed: %s", self._cfg.identifier, e)
+                continue
+            # Let a burst of setpoints for this channel settle into one write
+            await asyncio.sleep(COMMAND_DEBOUNCE_S)
+            payload, fut = self._pending.pop(key)
+            try:
+                await self._write(payload)
+            except asyncio.CancelledError:
+                fut.cancel()
+                raise
+            except Exception as e:
+                if not fut.done():
+                    fut.set_exception(e)
+            else:
+                if not fut.done():
+                    fut.set_result(None)
 
     async def set_fan_percent(self, percent: int) -> None:
-        raw = pct_to_raw(percent, self._cfg.fan_max_raw)
-        _LOGGER.info("FAN COMMAND: Setting fan to %d%% (raw value: %d/0x%02X)", percent, raw, raw)
+        command_bytes = self._cfg.fan_pct_bytes[clamp_pct(percent)]
+        raw = command_bytes[LEVEL_INDEX]
+        _LOGGER.debug("FAN COMMAND: Setting fan to %d%% (raw value: %d/0x%02X)", percent, raw, raw)
         _LOGGER.debug("FAN COMMAND: Using template '%s' with max_raw=%d", FAN_MANUAL_CMD, self._cfg.fan_max_raw)
-        command_bytes = render_cmd(FAN_MANUAL_CMD, raw)
-        _LOGGER.debug("FAN COMMAND: Generated command bytes: %s", command_bytes.hex().upper())
-        await self._write(command_bytes)
+        _LOGGER.debug("FAN COMMAND: Generated command bytes: %s", _Hex(command_bytes))
+        await self._submit("fan", command_bytes)
 
     async def set_fan_auto(self) -> None:
-        await self._write(render_cmd(FAN_AUTO_CMD))
+        # Shares the "fan" channel so auto and manual commands stay latest-wins.
+        await self._submit("fan", _FAN_AUTO_BYTES)
 
     async def set_light_percent(self, percent: int) -> None:
-        raw = pct_to_raw(percent, self._cfg.light_max_raw)
-        await self._write(render_cmd(LIGHT_LEVEL_CMD, raw))
+        await self._submit("light", self._cfg.light_pct_bytes[clamp_pct(percent)])
 
     async def set_light_auto(self) -> None:
-        await self._write(render_cmd(LIGHT_AUTO_CMD))
+        await self._submit("light", _LIGHT_AUTO_BYTES)
 
     async def _discover_services(self) -> None:
         """Discover and log all services and characteristics for debugging."""
         if not self._client or not self._client.is_connected:
             return
+        # The walk below exists purely for logging
+        if not _LOGGER.isEnabledFor(logging.DEBUG):
+            return
             
         try:
-            _LOGGER.info("BLE DISCOVERY: Discovering services for device %s", self._cfg.identifier)
-            services = await self._client.get_services()
+            _LOGGER.debug("BLE DISCOVERY: Discovering services for device %s", self._cfg.identifier)
+            services = self._client.services
             
             for service in services.services.values():
-                _LOGGER.info("BLE SERVICE: %s (%s)", service.uuid, service.description)
+                _LOGGER.debug("BLE SERVICE: %s (%s)", service.uuid, service.description)
                 
                 for char in service.characteristics:
                     properties = []
@@ -216,94 +467,14 @@ class SenseBleController:
                     if "notify" in char.properties:
                         properties.append("NOTIFY")
                     
-                    _LOGGER.info(
+                    _LOGGER.debug(
                         "BLE CHAR:    %s [%s] (%s)", 
                         char.uuid, "/".join(properties), char.description
                     )
                     
                     # Highlight our target characteristic
-                    if char.uuid.lower() == COMMAND_CHAR_UUID.lower():
-                        _LOGGER.warning("BLE TARGET: Found our target characteristic %s", COMMAND_CHAR_UUID)
+                    if char.uuid.lower() == _COMMAND_CHAR_UUID_LC:
+                        _LOGGER.debug("BLE TARGET: Found our target characteristic %s", COMMAND_CHAR_UUID)
                         
         except Exception as e:
             _LOGGER.error("BLE DISCOVERY: Failed to discover services: %s", e)
-
-    async def test_device_responsiveness(self) -> None:
-        """Test different write methods and basic commands for debugging."""
-        if not self._client or not self._client.is_connected:
-            _LOGGER.error("DEVICE TEST: Not connected, cannot test")
-            return
-            
-        _LOGGER.info("DEVICE TEST: Testing basic device responsiveness")
-        
-        # Test 1: Try write with response=True
-        try:
-            test_cmd = render_cmd(FAN_MANUAL_CMD, 30)  # 25% fan speed
-            _LOGGER.info("DEVICE TEST: Trying write WITH response: %s", test_cmd.hex().upper())
-            await self._client.write_gatt_char(COMMAND_CHAR_UUID, test_cmd, response=True)
-            _LOGGER.info("DEVICE TEST: Write with response SUCCESS")
-        except Exception as e:
-            _LOGGER.warning("DEVICE TEST: Write with response FAILED: %s", e)
-            
-        await asyncio.sleep(1)
-        
-        # Test 2: Try write without response (current method)
-        try:
-            test_cmd = render_cmd(FAN_MANUAL_CMD, 60)  # 50% fan speed  
-            _LOGGER.info("DEVICE TEST: Trying write WITHOUT response: %s", test_cmd.hex().upper())
-            await self._client.write_gatt_char(COMMAND_CHAR_UUID, test_cmd, response=False)
-            _LOGGER.info("DEVICE TEST: Write without response SUCCESS")
-        except Exception as e:
-            _LOGGER.warning("DEVICE TEST: Write without response FAILED: %s", e)
-            
-        await asyncio.sleep(1)
-        
-        # Test 3: Try auto command to see if device responds to any command
-        try:
-            auto_cmd = render_cmd(FAN_AUTO_CMD)
-            _LOGGER.info("DEVICE TEST: Trying auto command: %s", auto_cmd.hex().upper())
-            await self._client.write_gatt_char(COMMAND_CHAR_UUID, auto_cmd, response=False)
-            _LOGGER.info("DEVICE TEST: Auto command SUCCESS")
-        except Exception as e:
-            _LOGGER.warning("DEVICE TEST: Auto command FAILED: %s", e)
-
-    async def verify_connection_state(self) -> bool:
-        """Verify device is properly connected and ready for commands."""
-        if not self._client:
-            _LOGGER.error("STATE CHECK: No BLE client exists")
-            return False
-            
-        if not self._client.is_connected:
-            _LOGGER.error("STATE CHECK: BLE client reports not connected")
-            return False
-            
-        try:
-            # Try to get services to verify connection is actually working
-            services = await self._client.get_services()
-            if not services:
-                _LOGGER.error("STATE CHECK: No services available - connection may be stale")
-                return False
-                
-            # Check if our target characteristic exists
-            target_char = None
-            for service in services.services.values():
-                for char in service.characteristics:
-                    if char.uuid.lower() == COMMAND_CHAR_UUID.lower():
-                        target_char = char
-                        break
-                        
-            if not target_char:
-                _LOGGER.error("STATE CHECK: Target characteristic %s not found", COMMAND_CHAR_UUID)
-                return False
-                
-            # Check if characteristic has write permissions
-            if "write" not in target_char.properties and "write-without-response" not in target_char.properties:
-                _LOGGER.error("STATE CHECK: Target characteristic not writable. Properties: %s", target_char.properties)
-                return False
-                
-            _LOGGER.debug("STATE CHECK: Connection verified - ready for commands")
-            return True
-            
-        except Exception as e:
-            _LOGGER.error("STATE CHECK: Failed to verify connection: %s", e)
-            return False
@@ -9,13 +9,52 @@ from homeassistant.components import bluetooth
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DOMAIN, CONF_IDENTIFIER, CONF_LIGHT_MAX_RAW, DEFAULT_LIGHT_MAX_RAW, SERVICE_UUID
+from .const import (
+    DOMAIN, CONF_IDENTIFIER, CONF_LIGHT_MAX_RAW, DEFAULT_LIGHT_MAX_RAW,
+    LIGHT_MAX_RAW_MAX, LIGHT_MAX_RAW_MIN, SERVICE_UUID,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+_SERVICE_UUID_LC = SERVICE_UUID.lower()
+
+_DEFAULT_NAME = "RørosHetta Sense"
+
+# Static form schemas, built once per process instead of on every step
+_USER_SCHEMA = vol.Schema({
+    vol.Required("setup_method", default="scan"): vol.In({
+        "scan": "Scan for devices in pairing mode",
+        "manual": "Enter device information manually"
+    })
+})
+
+_SCAN_ACTION_SCHEMA = vol.Schema({
+    vol.Required("action", default="rescan"): vol.In({
+        "rescan": "Scan again",
+        "manual": "Enter device manually"
+    })
+})
+
+_LIGHT_MAX_RAW = vol.All(vol.Coerce(int), vol.Range(min=LIGHT_MAX_RAW_MIN, max=LIGHT_MAX_RAW_MAX))
+
+_MANUAL_SCHEMA = vol.Schema({
+    vol.Required("identifier"): str,
+    vol.Optional("light_max_raw", default=DEFAULT_LIGHT_MAX_RAW): _LIGHT_MAX_RAW,
+})
+
+_CONFIGURE_SCHEMA = vol.Schema({
+    vol.Optional("light_max_raw", default=DEFAULT_LIGHT_MAX_RAW): _LIGHT_MAX_RAW,
+})
+
 class RorosHettaSenseConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    def __init__(self) -> None:
+        # Identifiers already found reachable during this flow
+        self._verified: set[str] = set()
+        # Short identifier shown in titles, set together with the unique ID
+        self._id_suffix = ""
+
     async def async_step_user(self, user_input=None) -> FlowResult:
         """Handle the user step - choose setup method."""
         if user_input is not None:
@@ -26,12 +65,7 @@ class RorosHettaSenseConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         return self.async_show_form(
             step_id="user",
-            data_schema=vol.Schema({
-                vol.Required("setup_method", default="scan"): vol.In({
-                    "scan": "Scan for devices in pairing mode",
-                    "manual": "Enter device information manually"
-                })
-            })
+            data_schema=_USER_SCHEMA,
         )
 
     async def async_step_scan(self, user_input=None) -> FlowResult:
@@ -43,19 +77,18 @@ class RorosHettaSenseConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 # User selected a device from the scan results
                 identifier = user_input["device"]
                 await self.async_set_unique_id(identifier)
+                self._id_suffix = identifier[-5:]
                 self._abort_if_unique_id_configured()
                 
                 # Store device info for configuration step
-                self.context["title_placeholders"] = {
-                    "name": "RørosHetta Sense",
-                    "identifier": identifier[-5:],
-                }
+                self._set_title_placeholders()
                 return await self.async_step_configure()
             else:
                 # User clicked "Rescan" or "Manual Setup"
                 if user_input.get("action") == "manual":
                     return await self.async_step_manual()
-                # Otherwise, fall through to rescan
+                # Otherwise, fall through to rescan; forget earlier reachability
+                self._verified.clear()
 
         # Perform device scan
         try:
@@ -86,16 +119,9 @@ class RorosHettaSenseConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors["base"] = "scan_failed"
 
         # Show scanning form with retry/manual options
-        schema = vol.Schema({
-            vol.Required("action", default="rescan"): vol.In({
-                "rescan": "Scan again",
-                "manual": "Enter device manually"
-            })
-        })
-        
         return self.async_show_form(
             step_id="scan",
-            data_schema=schema,
+            data_schema=_SCAN_ACTION_SCHEMA,
             errors=errors
         )
 
@@ -105,7 +131,7 @@ class RorosHettaSenseConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             identifier = user_input["identifier"].strip()
-            light_max_raw = user_input.get("light_max_raw", DEFAULT_LIGHT_MAX_RAW)
+            light_max_raw = user_input["light_max_raw"]
 
             if not identifier:
                 errors["base"] = "invalid_identifier"
@@ -114,9 +140,10 @@ class RorosHettaSenseConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 try:
                     await self._test_connection(identifier)
                     await self.async_set_unique_id(identifier)
+                    self._id_suffix = identifier[-5:]
                     self._abort_if_unique_id_configured()
                     return self.async_create_entry(
-                        title=f"RørosHetta Sense ({identifier[-5:]})",
+                        title=f"{_DEFAULT_NAME} ({self._id_suffix})",
                         data={
                             CONF_IDENTIFIER: identifier,
                             CONF_LIGHT_MAX_RAW: light_max_raw,
@@ -126,14 +153,9 @@ class RorosHettaSenseConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     _LOGGER.error("Connection test failed: %s", e)
                     errors["base"] = "cannot_connect"
 
-        schema = vol.Schema({
-            vol.Required("identifier"): str,
-            vol.Optional("light_max_raw", default=DEFAULT_LIGHT_MAX_RAW): vol.Coerce(int),
-        })
-
         return self.async_show_form(
             step_id="user",
-            data_schema=schema,
+            data_schema=_MANUAL_SCHEMA,
             errors=errors
         )
 
@@ -143,15 +165,14 @@ class RorosHettaSenseConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         device = discovery_info.device
         identifier = device.address
         
-        # Set unique ID and check if already configured
+        # Set unique ID and check if already configured; this raises AbortFlow
+        # for known devices, so repeat advertisements stop here
         await self.async_set_unique_id(identifier)
+        self._id_suffix = identifier[-5:]
         self._abort_if_unique_id_configured()
 
         # Store device info for configuration step
-        self.context["title_placeholders"] = {
-            "name": device.name or "RørosHetta Sense",
-            "identifier": identifier[-5:],
-        }
+        self._set_title_placeholders(device.name)
         
         # Show confirmation form to user
         return await self.async_step_confirm_discovery()
@@ -173,7 +194,7 @@ class RorosHettaSenseConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
 
         if user_input is not None:
-            light_max_raw = user_input.get("light_max_raw", DEFAULT_LIGHT_MAX_RAW)
+            light_max_raw = user_input["light_max_raw"]
             identifier = self.unique_id
             
             # Validate device connection
@@ -185,39 +206,46 @@ class RorosHettaSenseConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             else:
                 # Create config entry
                 return self.async_create_entry(
-                    title=f"RørosHetta Sense ({identifier[-5:]})",
+                    title=f"{_DEFAULT_NAME} ({self._id_suffix})",
                     data={
                         CONF_IDENTIFIER: identifier,
                         CONF_LIGHT_MAX_RAW: light_max_raw,
                     },
                 )
 
-        schema = vol.Schema({
-            vol.Optional("light_max_raw", default=DEFAULT_LIGHT_MAX_RAW): vol.Coerce(int),
-        })
-        
         return self.async_show_form(
             step_id="configure",
-            data_schema=schema,
+            data_schema=_CONFIGURE_SCHEMA,
             errors=errors,
             description_placeholders=self.context.get("title_placeholders", {})
         )
 
 
+    def _set_title_placeholders(self, name: str | None = None) -> None:
+        """Store the placeholders shown for this flow's device in later steps."""
+        self.context["title_placeholders"] = {
+            "name": name or _DEFAULT_NAME,
+            "identifier": self._id_suffix,
+        }
+
     async def _test_connection(self, identifier: str) -> None:
         """Test connection to the device."""
+        if identifier in self._verified:
+            return
+
         device = bluetooth.async_ble_device_from_address(self.hass, identifier)
         if not device:
             raise HomeAssistantError(f"Device {identifier} not reachable")
         
+        self._verified.add(identifier)
         _LOGGER.debug("Connection test successful for device %s", identifier)
 
-    async def _scan_for_pairing_devices(self) -> list[dict[str, str]]:
+    async def _scan_for_pairing_devices(self) -> list[dict]:
         """Scan for RørosHetta devices that might be in pairing mode."""
         try:
-            scanner = bluetooth.async_get_scanner(self.hass)
-            # Scan for devices advertising our service UUID
-            discovered_devices = []
+            # Scan for devices advertising our service UUID; the same address can
+            # be reported by several scanners/proxies, so keep the best RSSI
+            by_address: dict[str, dict] = {}
             
             # Get recent service info for our service UUID
             service_infos = bluetooth.async_discovered_service_info(
@@ -225,14 +253,17 @@ class RorosHettaSenseConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             )
             
             for service_info in service_infos:
-                if SERVICE_UUID.lower() in [uuid.lower() for uuid in service_info.service_uuids]:
-                    discovered_devices.append({
+                if not any(uuid.lower() == _SERVICE_UUID_LC for uuid in service_info.service_uuids):
+                    continue
+                existing = by_address.get(service_info.address)
+                if existing is None or service_info.rssi > existing["rssi"]:
+                    by_address[service_info.address] = {
                         "address": service_info.address,
-                        "name": service_info.name or "RørosHetta Sense",
+                        "name": service_info.name or _DEFAULT_NAME,
                         "rssi": service_info.rssi
-                    })
+                    }
             
-            return discovered_devices
+            return list(by_address.values())
             
         except Exception as e:
             _LOGGER.error("Failed to scan for devices: %s", e)
@@ -3,7 +3,32 @@ DOMAIN = "roroshetta_sense"
 CONF_IDENTIFIER = "identifier"
 CONF_LIGHT_MAX_RAW = "light_max_raw"
 
+# Optional entry.options overrides for DeviceConfig link tuning fields
+CONF_MAX_RETRIES = "max_retries"
+CONF_CONNECT_TIMEOUT = "connect_timeout"
+CONF_WRITE_POST_DELAY = "write_post_delay"
+CONF_BACKOFF_BASE = "backoff_base"
+CONF_BACKOFF_CAP = "backoff_cap"
+TUNING_OPTIONS = (
+    CONF_MAX_RETRIES,
+    CONF_CONNECT_TIMEOUT,
+    CONF_WRITE_POST_DELAY,
+    CONF_BACKOFF_BASE,
+    CONF_BACKOFF_CAP,
+)
+
 DEFAULT_LIGHT_MAX_RAW = 90
+# Raw light levels are sent as a single byte
+LIGHT_MAX_RAW_MIN = 1
+LIGHT_MAX_RAW_MAX = 255
+
+# Window in which rapid setpoints for the same channel are coalesced into one write.
+# The single writer task waits this long before every write, which together with
+# one write at a time is what paces Write Without Response traffic.
+COMMAND_DEBOUNCE_S = 0.05
+
+# Upper bound for a single write before it is treated as a failed attempt
+WRITE_TIMEOUT_S = 2.0
 
 SERVICE_UUID = "0000f00d-1212-efde-1523-785fef13d123"
 COMMAND_CHAR_UUID = "0000babe-1212-efde-1523-785fef13d123"
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from homeassistant.helpers.entity import Entity
+
+from bleak.exc import BleakError
+
+_LOGGER = logging.getLogger(__name__)
+
+class OptimisticSetpoint:
+    """Optimistic setpoint handling shared by the fan and light entities.
+
+    Each requested value is shown at once and submitted to the controller in
+    request order; the controller already coalesces bursts per channel. A
+    background task awaits each result, and a failed write restores the last
+    value the controller accepted unless a newer value was requested since.
+    """
+
+    def __init__(
+        self,
+        entity: Entity,
+        apply: Callable[[int], None],
+        send: Callable[[int], Awaitable[None]],
+        describe: Callable[[int], str],
+    ) -> None:
+        self._entity = entity
+        self._apply = apply
+        self._send = send
+        self._describe = describe
+        self._tasks: set[asyncio.Task[None]] = set()
+        # Bumped on every request; only the newest request may roll back
+        self._seq = 0
+        # Last value the controller accepted, restored if a write fails
+        self._confirmed = 0
+
+    def request(self, value: int) -> None:
+        """Show value now and send it in the background."""
+        self._seq += 1
+        self._show(value)
+        task = self._entity.hass.async_create_background_task(
+            self._async_send(value, self._seq), f"{self._entity.entity_id} writer"
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def cancel(self) -> None:
+        """Stop waiting on writes still in flight."""
+        for task in self._tasks:
+            task.cancel()
+
+    def _show(self, value: int) -> None:
+        self._apply(value)
+        self._entity.async_write_ha_state()
+
+    async def _async_send(self, value: int, seq: int) -> None:
+        try:
+            await self._send(value)
+        except BleakError as e:
+            _LOGGER.error("Failed to %s: %s", self._describe(value), e)
+        except Exception as e:
+            _LOGGER.error("Unexpected error trying to %s: %s", self._describe(value), e)
+        else:
+            self._confirmed = value
+            return
+        # A newer request already replaced the optimistic state
+        if seq == self._seq:
+            self._show(self._confirmed)
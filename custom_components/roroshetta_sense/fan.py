@@ -7,10 +7,9 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from bleak.exc import BleakError
-
 from .const import DOMAIN
 from .ble import SenseBleController
+from .entity import OptimisticSetpoint
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,18 +25,21 @@ class SenseFan(FanEntity):
 
     def __init__(self, controller: SenseBleController) -> None:
         self._ctl = controller
-        self._attr_unique_id = f"{controller._cfg.identifier}_fan"
+        self._attr_unique_id = f"{controller.identifier}_fan"
+        self._setpoint = OptimisticSetpoint(
+            self, self._apply_state, controller.set_fan_percent,
+            lambda pct: f"set fan percentage to {pct}%",
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._setpoint.cancel()
 
     async def async_set_percentage(self, percentage: int) -> None:
-        try:
-            await self._ctl.set_fan_percent(percentage)
-            self._attr_percentage = int(percentage)
-            self._attr_is_on = int(percentage) > 0
-            self.async_write_ha_state()
-        except BleakError as e:
-            _LOGGER.error("Failed to set fan percentage to %d%%: %s", percentage, e)
-        except Exception as e:
-            _LOGGER.error("Unexpected error setting fan percentage to %d%%: %s", percentage, e)
+        self._setpoint.request(int(percentage))
+
+    def _apply_state(self, pct: int) -> None:
+        self._attr_percentage = pct
+        self._attr_is_on = pct > 0
 
     async def async_turn_on(self, percentage: int | None = None, **kwargs) -> None:
         await self.async_set_percentage(percentage if percentage is not None else 25)
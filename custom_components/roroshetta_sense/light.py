@@ -7,10 +7,9 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from bleak.exc import BleakError
-
 from .const import DOMAIN
 from .ble import SenseBleController
+from .entity import OptimisticSetpoint
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,28 +26,24 @@ class SenseLight(LightEntity):
 
     def __init__(self, controller: SenseBleController) -> None:
         self._ctl = controller
-        self._attr_unique_id = f"{controller._cfg.identifier}_light"
+        self._attr_unique_id = f"{controller.identifier}_light"
+        self._setpoint = OptimisticSetpoint(
+            self, self._apply_state, self._async_send,
+            lambda brightness: "turn on light" if brightness else "turn off light",
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._setpoint.cancel()
 
     async def async_turn_on(self, **kwargs) -> None:
-        try:
-            brightness = int(kwargs.get("brightness", 255))
-            pct = round(brightness * 100 / 255)
-            await self._ctl.set_light_percent(pct)
-            self._attr_brightness = brightness
-            self._attr_is_on = True
-            self.async_write_ha_state()
-        except BleakError as e:
-            _LOGGER.error("Failed to turn on light: %s", e)
-        except Exception as e:
-            _LOGGER.error("Unexpected error turning on light: %s", e)
+        self._setpoint.request(int(kwargs.get("brightness", 255)))
 
     async def async_turn_off(self, **kwargs) -> None:
-        try:
-            await self._ctl.set_light_percent(0)
-            self._attr_brightness = 0
-            self._attr_is_on = False
-            self.async_write_ha_state()
-        except BleakError as e:
-            _LOGGER.error("Failed to turn off light: %s", e)
-        except Exception as e:
-            _LOGGER.error("Unexpected error turning off light: %s", e)
+        self._setpoint.request(0)
+
+    def _apply_state(self, brightness: int) -> None:
+        self._attr_brightness = brightness
+        self._attr_is_on = brightness > 0
+
+    async def _async_send(self, brightness: int) -> None:
+        await self._ctl.set_light_percent((brightness * 100 + 127) // 255)
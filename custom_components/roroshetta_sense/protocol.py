@@ -1,18 +1,48 @@
 from __future__ import annotations
 
-FAN_MANUAL_CMD  = "01 20 00 00 XX 00 00 00"
-FAN_AUTO_CMD    = "04 20 00 00 02 00 00 00"
+from functools import lru_cache
+from typing import Final
 
-LIGHT_LEVEL_CMD = "05 20 00 00 XX 00 00 00"
-LIGHT_AUTO_CMD  = "08 20 00 00 02 00 00 00"
+FAN_MANUAL_CMD: Final  = "01 20 00 00 XX 00 00 00"
+FAN_AUTO_CMD: Final    = "04 20 00 00 02 00 00 00"
 
-FAN_MAX_RAW_DEFAULT = 120  # observed max (0x78)
+LIGHT_LEVEL_CMD: Final = "05 20 00 00 XX 00 00 00"
+LIGHT_AUTO_CMD: Final  = "08 20 00 00 02 00 00 00"
+
+FAN_MAX_RAW_DEFAULT: Final = 120  # observed max (0x78)
+
+LEVEL_INDEX: Final = 4  # the only byte replaced in level commands
+
+def clamp_pct(pct: int) -> int:
+    return max(0, min(100, int(pct)))
 
 def pct_to_raw(pct: int, max_raw: int) -> int:
-    pct = max(0, min(100, int(pct)))
-    return round(pct * max_raw / 100)
+    # Integer half-up rounding; stays off the float path
+    return (clamp_pct(pct) * max_raw + 50) // 100
 
+def _parse_template(template: str) -> bytes:
+    return bytes.fromhex(template.replace("XX", "00"))
+
+# Known templates parsed once; level templates get byte LEVEL_INDEX patched in
+_TEMPLATE_BYTES: Final[dict[str, bytes]] = {
+    tpl: _parse_template(tpl)
+    for tpl in (FAN_MANUAL_CMD, FAN_AUTO_CMD, LIGHT_LEVEL_CMD, LIGHT_AUTO_CMD)
+}
+
+# Setpoints are small bounded integers, so the working set of rendered frames
+# is tiny; caching also hands back the same bytes object for repeat setpoints.
+@lru_cache(maxsize=256)
 def render_cmd(template: str, value: int | None = None) -> bytes:
+    base = _TEMPLATE_BYTES.get(template)
+    if base is None:
+        base = _parse_template(template)
     if value is None:
-        return bytes.fromhex(template)
-    return bytes.fromhex(template.replace("XX", f"{value:02x}"))
+        return base
+    frame = bytearray(base)
+    frame[LEVEL_INDEX] = value
+    return bytes(frame)
+
+@lru_cache(maxsize=None)
+def pct_table(template: str, max_raw: int) -> tuple[bytes, ...]:
+    """Rendered frames for every percent 0-100, indexed by percent."""
+    return tuple(render_cmd(template, pct_to_raw(pct, max_raw)) for pct in range(101))
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Awaitable, Callable
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
@@ -26,13 +27,29 @@ class _BaseAutoSwitch(SwitchEntity):
 
     def __init__(self, controller: SenseBleController, switch_type: str) -> None:
         self._ctl = controller
-        self._attr_unique_id = f"{controller._cfg.identifier}_{switch_type}_auto"
+        self._attr_unique_id = f"{controller.identifier}_{switch_type}_auto"
 
     async def async_turn_off(self, **kwargs) -> None:
         # Base implementation - each subclass should override this
         self._attr_is_on = False
         self.async_write_ha_state()
 
+    async def _async_apply(self, is_on: bool, command: Callable[[], Awaitable[None]], action: str) -> None:
+        """Show the new state immediately and roll it back if the command fails."""
+        previous = self._attr_is_on
+        self._attr_is_on = is_on
+        self.async_write_ha_state()
+        try:
+            await command()
+        except BleakError as e:
+            _LOGGER.error("Failed to %s: %s", action, e)
+        except Exception as e:
+            _LOGGER.error("Unexpected error trying to %s: %s", action, e)
+        else:
+            return
+        self._attr_is_on = previous
+        self.async_write_ha_state()
+
 class SenseFanAutoSwitch(_BaseAutoSwitch):
     _attr_name = "RørosHetta Fan Auto"
 
@@ -40,25 +57,11 @@ class SenseFanAutoSwitch(_BaseAutoSwitch):
         super().__init__(controller, "fan")
 
     async def async_turn_on(self, **kwargs) -> None:
-        try:
-            await self._ctl.set_fan_auto()
-            self._attr_is_on = True
-            self.async_write_ha_state()
-        except BleakError as e:
-            _LOGGER.error("Failed to enable fan auto mode: %s", e)
-        except Exception as e:
-            _LOGGER.error("Unexpected error enabling fan auto mode: %s", e)
+        await self._async_apply(True, self._ctl.set_fan_auto, "enable fan auto mode")
 
     async def async_turn_off(self, **kwargs) -> None:
-        try:
-            # Disable auto mode by setting manual fan to 0%
-            await self._ctl.set_fan_percent(0)
-            self._attr_is_on = False
-            self.async_write_ha_state()
-        except BleakError as e:
-            _LOGGER.error("Failed to disable fan auto mode: %s", e)
-        except Exception as e:
-            _LOGGER.error("Unexpected error disabling fan auto mode: %s", e)
+        # Disable auto mode by setting manual fan to 0%
+        await self._async_apply(False, lambda: self._ctl.set_fan_percent(0), "disable fan auto mode")
 
 class SenseLightAutoSwitch(_BaseAutoSwitch):
     _attr_name = "RørosHetta Light Auto"
@@ -67,22 +70,8 @@ class SenseLightAutoSwitch(_BaseAutoSwitch):
         super().__init__(controller, "light")
 
     async def async_turn_on(self, **kwargs) -> None:
-        try:
-            await self._ctl.set_light_auto()
-            self._attr_is_on = True
-            self.async_write_ha_state()
-        except BleakError as e:
-            _LOGGER.error("Failed to enable light auto mode: %s", e)
-        except Exception as e:
-            _LOGGER.error("Unexpected error enabling light auto mode: %s", e)
+        await self._async_apply(True, self._ctl.set_light_auto, "enable light auto mode")
 
     async def async_turn_off(self, **kwargs) -> None:
-        try:
-            # Disable auto mode by setting manual light to 0%
-            await self._ctl.set_light_percent(0)
-            self._attr_is_on = False
-            self.async_write_ha_state()
-        except BleakError as e:
-            _LOGGER.error("Failed to disable light auto mode: %s", e)
-        except Exception as e:
-            _LOGGER.error("Unexpected error disabling light auto mode: %s", e)
+        # Disable auto mode by setting manual light to 0%
+        await self._async_apply(False, lambda: self._ctl.set_light_percent(0), "disable light auto mode")